@@ -85,7 +85,7 @@ CREATE TABLE IF NOT EXISTS fact_financials (
 );
 
 ---------------------------------------------------------
--- 3. LOAD DATA FROM CSV FILES
+-- 3. LOAD DATA FROM CSV / PARQUET FILES
 ---------------------------------------------------------
 
 COPY dim_time (
@@ -118,12 +118,12 @@ FROM 'data/raw/dim_cost_center.csv'
 WITH (HEADER TRUE);
 
 COPY fact_transactions
-FROM 'data/raw/fact_transactions.csv'
-WITH (HEADER TRUE);
+FROM 'data/raw/fact_transactions.parquet'
+WITH (FORMAT PARQUET);
 
 COPY fact_financials
-FROM 'data/raw/fact_financials.csv'
-WITH (HEADER TRUE);
+FROM 'data/raw/fact_financials.parquet'
+WITH (FORMAT PARQUET);
 
 ---------------------------------------------------------
 -- 4. BASIC VALIDATION
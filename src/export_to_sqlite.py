@@ -22,25 +22,122 @@ This script:
 5. Writes all into:
       finance.sqlite
 
+The fact tables are streamed from DuckDB as Arrow record batches of
+BATCH_SIZE rows on the main thread (the only SQLite writer), so one batch
+is in memory at a time. The small tables (dimensions, KPI views, ML
+output) are read ahead on worker threads, one cursor each, at most
+MAX_WORKERS at once.
+
+The export is built in finance.sqlite.tmp and renamed over finance.sqlite
+only once it succeeds, so a failed run keeps the previous file. KPI views
+and predicted_churn are optional: one that fails to export is skipped
+with a warning.
+
 Power BI connects only to finance.sqlite.
 """
 
-import duckdb
 import sqlite3
-import pandas as pd
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import duckdb
 
 from src.config import PROJECT_ROOT
 
 DUCKDB_PATH = PROJECT_ROOT / "finance.duckdb"
 SQLITE_PATH = PROJECT_ROOT / "finance.sqlite"
+SQLITE_TMP_PATH = PROJECT_ROOT / "finance.sqlite.tmp"
+
+BATCH_SIZE = 100_000
+MAX_WORKERS = 4
+
+# Star-schema tables (required)
+BASE_TABLES = [
+    "dim_time",
+    "dim_customer",
+    "dim_product",
+    "dim_account",
+    "dim_cost_center",
+    "fact_transactions",
+    "fact_financials",
+]
+
+# Large tables: streamed batch by batch, never read ahead
+STREAMED_TABLES = {"fact_transactions", "fact_financials"}
+
+# KPI views (optional but recommended)
+KPI_VIEWS = [
+    "vw_pnl_monthly",
+    "vw_customer_profitability",
+    "vw_product_profitability",
+]
+
+
+# ---------------------------------------------------------
+# Helper: SQLite column type for a DuckDB column type
+# ---------------------------------------------------------
+def sqlite_type(dtype: str) -> str:
+    if dtype.startswith("DECIMAL") or dtype in ("FLOAT", "DOUBLE", "HUGEINT", "UHUGEINT"):
+        return "REAL"
+    if dtype.endswith(("INT", "INTEGER")) or dtype == "BOOLEAN":
+        return "INTEGER"
+    if dtype == "DATE" or dtype.startswith("TIMESTAMP"):
+        return "TIMESTAMP"
+    return "TEXT"
+
+
+# ---------------------------------------------------------
+# Helper: SELECT expression yielding values sqlite3 can bind
+# ---------------------------------------------------------
+def select_expr(col: str, dtype: str) -> str:
+    # HUGEINT (e.g. SUM over integers) reaches Arrow as decimal128 too
+    if dtype.startswith("DECIMAL") or dtype in ("HUGEINT", "UHUGEINT"):
+        return f'CAST("{col}" AS DOUBLE) AS "{col}"'
+    if dtype == "BOOLEAN":
+        return f'CAST("{col}" AS INTEGER) AS "{col}"'
+    if dtype == "DATE" or dtype.startswith("TIMESTAMP"):
+        return f"strftime(\"{col}\", '%Y-%m-%d %H:%M:%S') AS \"{col}\""
+    if dtype.startswith("ENUM"):
+        return f'CAST("{col}" AS VARCHAR) AS "{col}"'
+    return f'"{col}"'
+
+
+# ---------------------------------------------------------
+# Helper: open a DuckDB table/view as a stream of Arrow batches
+# ---------------------------------------------------------
+def open_table(cur: duckdb.DuckDBPyConnection, name: str):
+    columns = [(col, dtype) for col, dtype, *_ in cur.execute(f"DESCRIBE {name}").fetchall()]
+    select = ", ".join(select_expr(col, dtype) for col, dtype in columns)
+    return columns, cur.execute(f"SELECT {select} FROM {name}").arrow(BATCH_SIZE)
+
+
+# ---------------------------------------------------------
+# Helper: read a small DuckDB table/view fully (worker thread)
+# ---------------------------------------------------------
+def fetch_table(con: duckdb.DuckDBPyConnection, name: str):
+    # Each thread gets its own cursor; the shared connection serializes queries
+    cur = con.cursor()
+    columns, reader = open_table(cur, name)
+    batches = reader.read_all().to_batches(BATCH_SIZE)
+    cur.close()
+    return columns, batches
 
 
 # ---------------------------------------------------------
-# Helper: write a DataFrame to SQLite
+# Helper: write Arrow record batches to SQLite
 # ---------------------------------------------------------
-def write_table(conn: sqlite3.Connection, name: str, df: pd.DataFrame):
-    df.to_sql(name, conn, if_exists="replace", index=False)
-    print(f"  ✔ Wrote table: {name} ({len(df):,} rows)")
+def write_table(conn: sqlite3.Connection, name: str, columns: list, batches):
+    col_defs = ", ".join(f'"{col}" {sqlite_type(dtype)}' for col, dtype in columns)
+    conn.execute(f'CREATE TABLE "{name}" ({col_defs})')
+
+    insert = f'INSERT INTO "{name}" VALUES ({", ".join("?" * len(columns))})'
+    rows = 0
+    for batch in batches:
+        conn.executemany(insert, zip(*(col.to_pylist() for col in batch.columns)))
+        rows += batch.num_rows
+
+    print(f"  ✔ Wrote table: {name} ({rows:,} rows)")
 
 
 # ---------------------------------------------------------
@@ -51,52 +148,77 @@ def export_to_sqlite():
     con = duckdb.connect(str(DUCKDB_PATH))
 
     print("📦 Exporting tables and views to SQLite...")
-    sqlite_conn = sqlite3.connect(SQLITE_PATH)
+    SQLITE_TMP_PATH.unlink(missing_ok=True)
+    sqlite_conn = sqlite3.connect(SQLITE_TMP_PATH)
+
+    # The file is rebuilt from scratch on every run and only replaces
+    # finance.sqlite on success: skip the rollback journal and fsyncs.
+    sqlite_conn.execute("PRAGMA journal_mode=OFF")
+    sqlite_conn.execute("PRAGMA synchronous=OFF")
+    sqlite_conn.execute("PRAGMA temp_store=MEMORY")
+    sqlite_conn.execute("PRAGMA locking_mode=EXCLUSIVE")
+
+    # Views and ML output are optional; check which ones exist up front
+    existing = {row[0] for row in con.execute("SHOW TABLES").fetchall()}
 
     # ------------------------------------
     # 1. Base dimension & fact tables
     # ------------------------------------
-    base_tables = [
-        "dim_time",
-        "dim_customer",
-        "dim_product",
-        "dim_account",
-        "dim_cost_center",
-        "fact_transactions",
-        "fact_financials",
-    ]
-
-    for table in base_tables:
-        df = con.execute(f"SELECT * FROM {table}").fetchdf()
-        write_table(sqlite_conn, table, df)
+    tables = list(BASE_TABLES)
 
     # ------------------------------------
     # 2. KPI views (optional but recommended)
     # ------------------------------------
-    kpi_views = [
-        "vw_pnl_monthly",
-        "vw_customer_profitability",
-        "vw_product_profitability",
-    ]
-
-    for view in kpi_views:
-        try:
-            df = con.execute(f"SELECT * FROM {view}").fetchdf()
-            write_table(sqlite_conn, view, df)
-        except Exception as e:
-            print(f"  ⚠ Warning: Could not export view {view} → {e}")
+    for view in KPI_VIEWS:
+        if view in existing:
+            tables.append(view)
+        else:
+            print(f"  ⚠ Warning: Could not export view {view} → view not found")
 
     # ------------------------------------
     # 3. ML Output: predicted_churn
     # ------------------------------------
-    try:
-        df = con.execute("SELECT * FROM predicted_churn").fetchdf()
-        write_table(sqlite_conn, "predicted_churn", df)
-    except Exception:
+    if "predicted_churn" in existing:
+        tables.append("predicted_churn")
+    else:
         print("  ⚠ No 'predicted_churn' table found. Please run churn_model.py first.")
 
+    # Small tables are read ahead on worker threads while the main thread
+    # (the only SQLite writer) inserts in order; fact tables are streamed on
+    # the main thread. Single transaction: one commit per export.
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex, sqlite_conn:
+            prefetch = iter([t for t in tables if t not in STREAMED_TABLES])
+            pending = deque(ex.submit(fetch_table, con, t) for t in islice(prefetch, MAX_WORKERS))
+            for table in tables:
+                try:
+                    if table in STREAMED_TABLES:
+                        cur = con.cursor()
+                        columns, reader = open_table(cur, table)
+                        write_table(sqlite_conn, table, columns, reader)
+                        cur.close()
+                        continue
+
+                    future = pending.popleft()
+                    for t in islice(prefetch, 1):
+                        pending.append(ex.submit(fetch_table, con, t))
+                    columns, batches = future.result()
+                    write_table(sqlite_conn, table, columns, batches)
+                except Exception as e:
+                    if table in BASE_TABLES:
+                        raise
+                    # Optional view / ML output: drop any partial table, keep going
+                    sqlite_conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+                    print(f"  ⚠ Warning: Could not export {table} → {e}")
+    except BaseException:
+        sqlite_conn.close()
+        SQLITE_TMP_PATH.unlink(missing_ok=True)
+        raise
+    finally:
+        con.close()
+
     sqlite_conn.close()
-    con.close()
+    SQLITE_TMP_PATH.replace(SQLITE_PATH)
 
     print(f"🏁 Export complete. SQLite database created at: {SQLITE_PATH}")
 
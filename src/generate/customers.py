@@ -22,29 +22,27 @@ def generate_dim_customer(dim_time: pd.DataFrame) -> pd.DataFrame:
     # -----------------------------
     # 2. Churn simulation
     # -----------------------------
-    churn_dates = []
-
-    for acq in acq_dates:
-        churn_year = acq.year
-        churn_date = pd.NaT
-
-        while churn_year <= end.year:
-            if rng.random() < ANNUAL_CHURN_RATE:
-                month = int(rng.integers(1, 13))
-                churn_candidate = pd.Timestamp(year=churn_year, month=month, day=1)
-
-                if churn_candidate > acq:
-                    churn_date = churn_candidate
-                break
-
-            churn_year += 1
-
-        if pd.notna(churn_date) and churn_date > end:
-            churn_date = pd.NaT
-
-        churn_dates.append(churn_date)
+    # Years until churn: first success of an annual Bernoulli(ANNUAL_CHURN_RATE)
+    # trial starting in the acquisition year, drawn for all customers at once.
+    churn_year = acq_dates.year.to_numpy() + rng.geometric(ANNUAL_CHURN_RATE, size=NUM_CUSTOMERS) - 1
+    churn_month = rng.integers(1, 13, size=NUM_CUSTOMERS)
+
+    churn_dates = pd.to_datetime(
+        pd.DataFrame(
+            {
+                "year": np.minimum(churn_year, end.year),
+                "month": churn_month,
+                "day": 1,
+            }
+        )
+    )
 
-    churn_dates = pd.to_datetime(churn_dates)
+    # No churn beyond the horizon, and a churn month before acquisition means none
+    churn_dates = churn_dates.where(
+        (churn_year <= end.year)
+        & (churn_dates.to_numpy() > acq_dates.to_numpy())
+        & (churn_dates <= end)
+    )
 
     # -----------------------------
     # 3. Segments, regions, risk score
@@ -66,7 +64,7 @@ def generate_dim_customer(dim_time: pd.DataFrame) -> pd.DataFrame:
     # -----------------------------
     df = pd.DataFrame(
         {
-            "customer_id": np.arange(1, NUM_CUSTOMERS + 1),
+            "customer_id": np.arange(1, NUM_CUSTOMERS + 1, dtype=np.int32),
             "segment": segment,
             "region": region,
             "risk_score": risk_score,
@@ -75,7 +73,7 @@ def generate_dim_customer(dim_time: pd.DataFrame) -> pd.DataFrame:
         }
     )
 
-    df["is_active"] = df["churn_date"].isna().astype(int)
+    df["is_active"] = df["churn_date"].isna().astype(np.int8)
 
     return df[
         [
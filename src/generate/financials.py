@@ -1,26 +1,25 @@
 # src/generate/financials.py
 
+import duckdb
 import pandas as pd
 import numpy as np
 
 from src.utils import rng
 from src.config import OPEX_RATIO
 
+# Revenue account per product category (other categories -> DEFAULT_REVENUE_ACCOUNT)
+CATEGORY_ACCOUNT = {"Subscription": 4000, "Service": 4001}
+DEFAULT_REVENUE_ACCOUNT = 4002
+
+# OPEX account per department (other departments -> DEFAULT_OPEX_ACCOUNT)
+DEPT_OPEX = {"Sales": 6000, "Marketing": 6000, "Operations": 6100, "IT": 6200}
+DEFAULT_OPEX_ACCOUNT = 6300
+
 def category_to_account(cat: str) -> int:
-    if cat == "Subscription":
-        return 4000
-    if cat == "Service":
-        return 4001
-    return 4002
+    return CATEGORY_ACCOUNT.get(cat, DEFAULT_REVENUE_ACCOUNT)
 
 def dept_to_account(dept: str) -> int:
-    if dept in ("Sales", "Marketing"):
-        return 6000
-    if dept == "Operations":
-        return 6100
-    if dept == "IT":
-        return 6200
-    return 6300
+    return DEPT_OPEX.get(dept, DEFAULT_OPEX_ACCOUNT)
 
 def generate_fact_financials(
     fact_transactions: pd.DataFrame,
@@ -29,70 +28,119 @@ def generate_fact_financials(
     dim_time: pd.DataFrame,
 ) -> pd.DataFrame:
 
-    recs = []
-
-    tx = fact_transactions.merge(dim_product[["product_id", "category"]], on="product_id")
-
-    # -----------------------------
-    # Revenue postings
-    # -----------------------------
-    tx["account_id"] = tx["category"].apply(category_to_account)
-
-    rev_grp = tx.groupby(["date_key", "account_id"])["net_revenue"].sum().reset_index()
-
-    for _, r in rev_grp.iterrows():
-        recs.append((r.date_key, int(r.account_id), np.nan, float(r.net_revenue), "EUR"))
-
     # -----------------------------
-    # COGS postings
+    # Revenue / COGS / monthly revenue rollups (one DuckDB pass)
     # -----------------------------
-    cogs_grp = tx.groupby("date_key")["direct_cost"].sum().reset_index()
+    con = duckdb.connect()
+    con.register("tx", fact_transactions)
+    con.register("product", dim_product[["product_id", "category"]])
+    con.register("cal", dim_time[["date_key", "year", "month"]])
+    con.register(
+        "category_account",
+        pd.DataFrame({"category": list(CATEGORY_ACCOUNT), "account_id": list(CATEGORY_ACCOUNT.values())}),
+    )
 
-    for _, r in cogs_grp.iterrows():
-        recs.append((r.date_key, 5000, np.nan, -float(r.direct_cost), "EUR"))
+    # Amounts may arrive as float32; accumulate the ledger in DOUBLE
+    rollup = con.execute(
+        """
+        SELECT
+            GROUPING(date_key) AS by_month,
+            GROUPING(account_id) AS by_day,
+            date_key, account_id, year, month,
+            SUM(net_revenue) AS net_revenue,
+            SUM(direct_cost) AS direct_cost
+        FROM (
+            SELECT
+                t.date_key,
+                COALESCE(a.account_id, $default_account) AS account_id,
+                c.year,
+                c.month,
+                CAST(t.net_revenue AS DOUBLE) AS net_revenue,
+                CAST(t.direct_cost AS DOUBLE) AS direct_cost
+            FROM tx t
+            JOIN product p USING (product_id)
+            JOIN cal c USING (date_key)
+            LEFT JOIN category_account a USING (category)
+        )
+        GROUP BY GROUPING SETS ((date_key, account_id), (date_key), (year, month))
+        ORDER BY date_key, account_id, year, month
+        """,
+        {"default_account": DEFAULT_REVENUE_ACCOUNT},
+    ).fetchdf()
+    con.close()
+
+    by_month = rollup["by_month"].to_numpy() == 1
+    by_day = ~by_month & (rollup["by_day"].to_numpy() == 1)
+    by_account = ~by_month & ~by_day
+
+    # Revenue postings: per day and revenue account
+    rev_grp = rollup.loc[by_account, ["date_key", "account_id", "net_revenue"]]
+
+    # COGS postings: per day
+    cogs_grp = rollup.loc[by_day, ["date_key", "direct_cost"]]
 
     # -----------------------------
     # OPEX allocation (monthly)
     # -----------------------------
     # Monthly revenue
-    rev_daily = rev_grp.merge(dim_time[["date_key", "year", "month"]], on="date_key")
-
-    monthly_rev = rev_daily.groupby(["year", "month"])["net_revenue"].sum().reset_index()
-    monthly_rev.rename(columns={"net_revenue": "monthly_revenue"}, inplace=True)
-
-    # Find month-end posting date
-    month_end = (
-        dim_time[dim_time.is_month_end == 1].groupby(["year", "month"])["date_key"].max().to_dict()
+    monthly_rev = rollup.loc[by_month, ["year", "month", "net_revenue"]].rename(
+        columns={"net_revenue": "monthly_revenue"}
     )
 
+    # Month-end posting date (one is_month_end row per month)
+    month_end = dim_time.loc[dim_time.is_month_end == 1, ["year", "month", "date_key"]]
+    monthly_rev = monthly_rev.merge(month_end, on=["year", "month"])
+
     # Cost center weights
     cc = dim_cost_center.copy()
-    cc["account_id"] = cc["department"].apply(dept_to_account)
+    cc["account_id"] = cc["department"].map(DEPT_OPEX).fillna(DEFAULT_OPEX_ACCOUNT).astype(np.int32)
     w = np.array([0.2, 0.15, 0.25, 0.15, 0.1, 0.15][: len(cc)])
     w = w / w.sum()
 
-    for _, r in monthly_rev.iterrows():
-        y, m = int(r.year), int(r.month)
-        posting_date = month_end.get((y, m))
-        if not posting_date:
-            continue
+    # (months x cost centers) allocation with monthly weight noise
+    n_months, n_cc = len(monthly_rev), len(cc)
+    total_opex = -(monthly_rev["monthly_revenue"].to_numpy() * OPEX_RATIO)
+    noise = rng.normal(1.0, 0.05, size=(n_months, n_cc))
+    w_adj = w * noise
+    w_adj /= w_adj.sum(axis=1, keepdims=True)
+    amounts = total_opex[:, None] * w_adj
+
+    # -----------------------------
+    # Assemble postings column-wise: revenue | COGS | OPEX
+    # -----------------------------
+    n_rev, n_cogs = len(rev_grp), len(cogs_grp)
+    n_total = n_rev + n_cogs + n_months * n_cc
+    rev_end, cogs_end = n_rev, n_rev + n_cogs
+
+    date_key = np.empty(n_total, dtype=np.int32)
+    account_id = np.empty(n_total, dtype=np.int32)
+    cost_center_id = np.full(n_total, np.nan)
+    amount = np.empty(n_total)
+
+    date_key[:rev_end] = rev_grp["date_key"].to_numpy()
+    account_id[:rev_end] = rev_grp["account_id"].to_numpy()
+    amount[:rev_end] = rev_grp["net_revenue"].to_numpy()
 
-        total_opex = -(r.monthly_revenue * OPEX_RATIO)
-        noise = rng.normal(1.0, 0.05, size=len(cc))
-        w_adj = (w * noise) / (w * noise).sum()
+    date_key[rev_end:cogs_end] = cogs_grp["date_key"].to_numpy()
+    account_id[rev_end:cogs_end] = 5000
+    amount[rev_end:cogs_end] = -cogs_grp["direct_cost"].to_numpy()
 
-        for (_, row), weight in zip(cc.iterrows(), w_adj):
-            amount = total_opex * weight
-            recs.append(
-                (posting_date, int(row.account_id), int(row.cost_center_id), float(amount), "EUR")
-            )
+    date_key[cogs_end:] = np.repeat(monthly_rev["date_key"].to_numpy(), n_cc)
+    account_id[cogs_end:] = np.tile(cc["account_id"].to_numpy(), n_months)
+    cost_center_id[cogs_end:] = np.tile(cc["cost_center_id"].to_numpy(), n_months)
+    amount[cogs_end:] = amounts.ravel()
 
     df = pd.DataFrame(
-        recs,
-        columns=["date_key", "account_id", "cost_center_id", "amount", "currency"],
+        {
+            "date_key": date_key,
+            "account_id": account_id,
+            "cost_center_id": pd.array(cost_center_id, dtype="Int16"),
+            "amount": amount,
+            "currency": pd.Categorical.from_codes(np.zeros(n_total, dtype=np.int8), categories=["EUR"]),
+        }
     )
 
-    df["posting_id"] = np.arange(1, len(df) + 1)
+    df["posting_id"] = np.arange(1, len(df) + 1, dtype=np.int32)
 
     return df[
         [
@@ -10,32 +10,25 @@ def generate_dim_product() -> pd.DataFrame:
     categories = ["Subscription", "Service", "Loan", "Advisory"]
     cat_probs = [0.40, 0.30, 0.20, 0.10]
 
-    product_ids = np.arange(1, NUM_PRODUCTS + 1)
+    product_ids = np.arange(1, NUM_PRODUCTS + 1, dtype=np.int32)
     product_names = [f"Product {i}" for i in product_ids]
     product_categories = rng.choice(categories, size=NUM_PRODUCTS, p=cat_probs)
 
-    base_prices = []
-    direct_cost_ratios = []
+    # Per-category price range and direct-cost-ratio distribution,
+    # aligned with `categories`
+    cat_codes = pd.Categorical(product_categories, categories=categories).codes
 
-    for cat in product_categories:
-        if cat == "Subscription":
-            price = rng.uniform(50, 200)
-            dcr = np.clip(1 - BASE_MARGIN + rng.normal(0.00, 0.04), 0.25, 0.70)
+    price_low = np.array([50, 100, 300, 150])[cat_codes]
+    price_high = np.array([200, 400, 800, 600])[cat_codes]
+    base_prices = rng.uniform(price_low, price_high)
 
-        elif cat == "Service":
-            price = rng.uniform(100, 400)
-            dcr = np.clip(1 - BASE_MARGIN + rng.normal(0.05, 0.05), 0.30, 0.75)
-
-        elif cat == "Loan":
-            price = rng.uniform(300, 800)
-            dcr = np.clip(1 - BASE_MARGIN + rng.normal(-0.05, 0.05), 0.20, 0.65)
-
-        else:  # Advisory
-            price = rng.uniform(150, 600)
-            dcr = np.clip(1 - BASE_MARGIN + rng.normal(0.02, 0.05), 0.25, 0.72)
-
-        base_prices.append(price)
-        direct_cost_ratios.append(dcr)
+    dcr_shift = np.array([0.00, 0.05, -0.05, 0.02])[cat_codes]
+    dcr_sigma = np.array([0.04, 0.05, 0.05, 0.05])[cat_codes]
+    dcr_low = np.array([0.25, 0.30, 0.20, 0.25])[cat_codes]
+    dcr_high = np.array([0.70, 0.75, 0.65, 0.72])[cat_codes]
+    direct_cost_ratios = np.clip(
+        1 - BASE_MARGIN + rng.normal(dcr_shift, dcr_sigma), dcr_low, dcr_high
+    )
 
     df = pd.DataFrame(
         {
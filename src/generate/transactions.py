@@ -6,97 +6,126 @@ import numpy as np
 from src.config import REVENUE_SEASONALITY, MACRO_SHOCKS
 from src.utils import rng
 
+def month_key(dates: pd.Series) -> np.ndarray:
+    return (dates.dt.year * 12 + dates.dt.month - 1).to_numpy()
+
 def generate_fact_transactions(
     dim_customer: pd.DataFrame,
     dim_product: pd.DataFrame,
     dim_time: pd.DataFrame,
 ) -> pd.DataFrame:
 
-    # Lookup by (year, month)
-    date_index = {}
-    for (year, month), group in dim_time.groupby(["year", "month"]):
-        date_index[(year, month)] = group.date_key.values
-
-    products = dim_product.set_index("product_id")
-    product_ids = products.index.values
+    # Candidate date keys per calendar month in CSR layout: month i owns
+    # date_key_flat[month_start[i] : month_start[i] + days_in_month[i]]
+    calendar = dim_time.sort_values("date_key")
+    date_key_flat = calendar["date_key"].to_numpy()
+
+    # Integer month key year * 12 + (month - 1); consecutive months differ by 1
+    month_keys, days_in_month = np.unique(month_key(calendar["date"]), return_counts=True)
+    month_start = np.concatenate([[0], np.cumsum(days_in_month)[:-1]])
+
+    # Seasonality * Macro shock per calendar month
+    month_year = month_keys // 12
+    month_quarter = month_keys % 12 // 3 + 1
+    month_mult = (
+        pd.Series(month_quarter).map(REVENUE_SEASONALITY).to_numpy()
+        * pd.Series(month_year).map(MACRO_SHOCKS).fillna(1.0).to_numpy()
+    )
 
-    tx_records = []
+    # Product attributes as flat arrays indexed by row position (SoA)
+    product_ids = dim_product["product_id"].to_numpy()
+    base_price_arr = dim_product["base_price"].to_numpy()
+    dcr_arr = dim_product["direct_cost_ratio"].to_numpy()
 
     # Precompute spend tiers (customer heterogeneity)
     spend_tiers = rng.choice([0.5, 1.0, 2.0, 4.0], size=len(dim_customer), p=[0.25, 0.45, 0.25, 0.05])
-    spend_map = dict(zip(dim_customer["customer_id"], spend_tiers))
 
-    # Segment multipliers
-    seg_rev_mult = {"Retail": 1.0, "SME": 1.2, "Corporate": 1.5}
-    seg_cost_mult = {"Retail": 1.00, "SME": 0.95, "Corporate": 0.88}
+    # Segment multipliers, aligned with `segments`
+    segments = ["Retail", "SME", "Corporate"]
+    seg_rev_mult = np.array([1.0, 1.2, 1.5])
+    seg_cost_mult = np.array([1.00, 0.95, 0.88])
 
     # Baseline monthly transaction rate per segment
-    seg_lambda = {"Retail": 0.4, "SME": 0.8, "Corporate": 1.2}
-
-    for _, cust in dim_customer.iterrows():
-        cid = int(cust.customer_id)
-        seg = cust.segment
-        acq = cust.acquisition_date
-        churn = cust.churn_date if pd.notna(cust.churn_date) else dim_time.date.max()
+    seg_lambda = np.array([0.4, 0.8, 1.2])
 
-        months = pd.period_range(acq.to_period("M"), churn.to_period("M"), freq="M")
+    seg_codes = pd.Categorical(dim_customer["segment"], categories=segments).codes
 
-        for period in months:
-            year, month = period.year, period.month
+    channels = ["Online", "Branch", "Partner"]
+    channel_cdf = np.array([0.6, 0.85, 1.0])
 
-            if (year, month) not in date_index:
-                continue
+    # -----------------------------
+    # 1. Active (customer, month) pairs
+    # -----------------------------
+    # First / last active month per customer as positions in `month_keys`
+    acq = month_key(dim_customer["acquisition_date"])
+    churn = month_key(dim_customer["churn_date"].fillna(dim_time.date.max()))
 
-            # Seasonality * Macro shock
-            seas = REVENUE_SEASONALITY[period.quarter]
-            macro = MACRO_SHOCKS.get(year, 1.0)
+    first = np.maximum(acq - month_keys[0], 0)
+    last = np.minimum(churn - month_keys[0], len(month_keys) - 1)
+    n_active = np.maximum(last - first + 1, 0)
 
-            # Monthly expected number of transactions
-            lam = seg_lambda[seg] * spend_map[cid]
-            lam = max(lam, 0.05)
+    # Expand each customer to its tenure months: cust_pos repeats, month_pos
+    # counts up from the customer's first month
+    cust_pos = np.repeat(np.arange(len(dim_customer)), n_active)
+    row_start = np.cumsum(n_active) - n_active
+    month_pos = np.repeat(first - row_start, n_active) + np.arange(n_active.sum())
 
-            n_tx = rng.poisson(lam)
-            if n_tx == 0:
-                continue
+    # Monthly expected number of transactions
+    lam = np.maximum(np.take(seg_lambda, seg_codes[cust_pos]) * spend_tiers[cust_pos], 0.05)
+    n_tx = rng.poisson(lam)
 
-            possible_dates = date_index[(year, month)]
+    # -----------------------------
+    # 2. One row per transaction
+    # -----------------------------
+    cust_pos = np.repeat(cust_pos, n_tx)
+    month_pos = np.repeat(month_pos, n_tx)
+    n_total = len(cust_pos)
 
-            for _ in range(n_tx):
-                date_key = int(rng.choice(possible_dates))
-                pid = int(rng.choice(product_ids))
+    day_pos = rng.integers(0, days_in_month[month_pos])
+    date_keys = date_key_flat[month_start[month_pos] + day_pos]
 
-                p = products.loc[pid]
-                base_price = p.base_price
-                dcr = p.direct_cost_ratio
+    prod_pos = rng.integers(0, len(product_ids), size=n_total)
+    pids = product_ids[prod_pos]
+    base_price = base_price_arr[prod_pos]
+    dcr = dcr_arr[prod_pos]
 
-                qty = max(1, int(rng.poisson(1.1)))
+    qty = np.maximum(1, rng.poisson(1.1, size=n_total))
 
-                noise = rng.lognormal(mean=0, sigma=0.15)
-                unit_price = base_price * seg_rev_mult[seg] * spend_map[cid] * seas * macro * noise
+    noise = rng.lognormal(mean=0, sigma=0.15, size=n_total)
+    seg = seg_codes[cust_pos]
+    unit_price = base_price * seg_rev_mult[seg] * spend_tiers[cust_pos] * month_mult[month_pos] * noise
 
-                revenue = unit_price * qty
-                cost = revenue * (dcr * seg_cost_mult[seg])
+    revenue = unit_price * qty
+    cost = revenue * (dcr * seg_cost_mult[seg])
 
-                channel = rng.choice(["Online", "Branch", "Partner"], p=[0.6, 0.25, 0.15])
-
-                tx_records.append(
-                    (cid, date_key, pid, qty, revenue, cost, channel)
-                )
+    # Channel mix 60/25/15 by inverse CDF; codes index straight into the categories
+    channel_codes = np.searchsorted(channel_cdf, rng.random(n_total), side="right")
+    channel = pd.Categorical.from_codes(channel_codes, categories=channels)
 
     df = pd.DataFrame(
-        tx_records,
-        columns=[
-            "customer_id",
-            "date_key",
-            "product_id",
-            "quantity",
-            "net_revenue",
-            "direct_cost",
-            "channel",
-        ],
+        {
+            "customer_id": dim_customer["customer_id"].to_numpy()[cust_pos],
+            "date_key": date_keys,
+            "product_id": pids,
+            "quantity": qty,
+            "net_revenue": revenue,
+            "direct_cost": cost,
+            "channel": channel,
+        }
     )
 
-    df["transaction_id"] = np.arange(1, len(df) + 1)
+    df["transaction_id"] = np.arange(1, len(df) + 1, dtype=np.int32)
+
+    df = df.astype(
+        {
+            "customer_id": "int32",
+            "product_id": "int32",
+            "date_key": "int32",
+            "quantity": "int16",
+            "net_revenue": "float32",
+            "direct_cost": "float32",
+        }
+    )
 
     return df[
         [
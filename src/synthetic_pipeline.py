@@ -1,5 +1,9 @@
 # src/synthetic_pipeline.py
 
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
 from src.config import DATA_RAW
 from src.generate.time import generate_dim_time
 from src.generate.customers import generate_dim_customer
@@ -9,6 +13,14 @@ from src.generate.cost_centers import generate_dim_cost_center
 from src.generate.transactions import generate_fact_transactions
 from src.generate.financials import generate_fact_financials
 
+def write_csv(df: pd.DataFrame, path):
+    # Arrow's C++ CSV writer; timestamps are written as plain dates
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    schema = pa.schema(
+        pa.field(f.name, pa.date32()) if pa.types.is_timestamp(f.type) else f for f in table.schema
+    )
+    pacsv.write_csv(table.cast(schema), path)
+
 def main():
     print("Generating dimensions...")
 
@@ -26,13 +38,16 @@ def main():
     )
 
     print("Writing CSVs...")
-    dim_time.to_csv(DATA_RAW / "dim_time.csv", index=False)
-    dim_customer.to_csv(DATA_RAW / "dim_customer.csv", index=False)
-    dim_product.to_csv(DATA_RAW / "dim_product.csv", index=False)
-    dim_account.to_csv(DATA_RAW / "dim_account.csv", index=False)
-    dim_cost_center.to_csv(DATA_RAW / "dim_cost_center.csv", index=False)
-    fact_transactions.to_csv(DATA_RAW / "fact_transactions.csv", index=False)
-    fact_financials.to_csv(DATA_RAW / "fact_financials.csv", index=False)
+    write_csv(dim_time, DATA_RAW / "dim_time.csv")
+    write_csv(dim_customer, DATA_RAW / "dim_customer.csv")
+    write_csv(dim_product, DATA_RAW / "dim_product.csv")
+    write_csv(dim_account, DATA_RAW / "dim_account.csv")
+    write_csv(dim_cost_center, DATA_RAW / "dim_cost_center.csv")
+
+    # Fact tables are large: columnar Parquet, bulk-loaded by DuckDB
+    print("Writing Parquet fact tables...")
+    fact_transactions.to_parquet(DATA_RAW / "fact_transactions.parquet", index=False, compression="zstd")
+    fact_financials.to_parquet(DATA_RAW / "fact_financials.parquet", index=False, compression="zstd")
 
     print("✓ Synthetic dataset complete.")
 